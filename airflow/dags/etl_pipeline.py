@@ -1,11 +1,16 @@
 from airflow import DAG
 from airflow.operators.python_operator import PythonOperator
 from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
 import boto3
 import snowflake.connector
 from kafka import KafkaConsumer
+import csv
+import gzip
 import json
 import os
+import tempfile
+import uuid
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -21,12 +26,25 @@ SNOWFLAKE_CONN_PARAMS = {
     'schema': os.getenv('SNOWFLAKE_SCHEMA')
 }
 
+# Target tables and the record fields loaded into them
+EQUITY_TABLE = 'your_table'
+EQUITY_COLUMNS = ['symbol', 'sector', 'price', 'volume', 'timestamp', 'change_percent', 'market_cap', 'volatility']
+COMMODITY_TABLE = 'commodity_table'
+COMMODITY_COLUMNS = ['stock_name', 'base_price', 'current_price', 'timestamp']
+
+# Number of S3 objects fetched in parallel
+S3_FETCH_WORKERS = int(os.getenv('S3_FETCH_WORKERS', 16))
+
+# Rows per staged file for bulk loads into Snowflake
+LOAD_BATCH_ROWS = int(os.getenv('SNOWFLAKE_LOAD_BATCH_ROWS', 100000))
+
 # S3 client
 s3_client = boto3.client(
     's3',
     aws_access_key_id=os.getenv('access_key'),
     aws_secret_access_key=os.getenv('secret_key'),
-    region_name=os.getenv('region')
+    region_name=os.getenv('region'),
+    endpoint_url=os.getenv('s3_endpoint_url')
 )
 
 # Kafka consumer
@@ -36,6 +54,8 @@ consumer = KafkaConsumer(
     auto_offset_reset='earliest',
     enable_auto_commit=True,
     group_id='your_group_id',
+    # Stop iterating once the topic has been idle this long, so the task can finish
+    consumer_timeout_ms=int(os.getenv('KAFKA_CONSUMER_TIMEOUT_MS', 10000)),
     value_deserializer=lambda x: json.loads(x.decode('utf-8'))
 )
 
@@ -56,15 +76,25 @@ dag = DAG(
     schedule_interval=timedelta(days=1),
 )
 
-def extract_from_s3():
+def fetch_s3_object(bucket_name, key):
+    """Read one S3 object and return its records, decompressing gzip batches"""
+    body = s3_client.get_object(Bucket=bucket_name, Key=key)['Body'].read()
+    if key.endswith('.gz'):
+        body = gzip.decompress(body)
+    return json.loads(body.decode('utf-8'))['data']
+
+def extract_from_s3(prefix):
     bucket_name = os.getenv('bucket')
-    prefix = os.getenv('equity_prefix')
-    response = s3_client.list_objects_v2(Bucket=bucket_name, Prefix=prefix)
+    paginator = s3_client.get_paginator('list_objects_v2')
+    keys = [
+        obj['Key']
+        for page in paginator.paginate(Bucket=bucket_name, Prefix=prefix)
+        for obj in page.get('Contents', [])
+    ]
     data = []
-    for obj in response.get('Contents', []):
-        file_obj = s3_client.get_object(Bucket=bucket_name, Key=obj['Key'])
-        file_data = json.loads(file_obj['Body'].read().decode('utf-8'))
-        data.extend(file_data['data'])
+    with ThreadPoolExecutor(max_workers=S3_FETCH_WORKERS) as executor:
+        for records in executor.map(lambda key: fetch_s3_object(bucket_name, key), keys):
+            data.extend(records)
     return data
 
 def extract_from_kafka():
@@ -73,26 +103,56 @@ def extract_from_kafka():
         data.append(message.value)
     return data
 
-def load_to_snowflake(data):
+def load_to_snowflake(data, table=EQUITY_TABLE, columns=EQUITY_COLUMNS):
+    """Bulk-load records by staging gzip CSV batches and running one COPY INTO"""
+    if not data:
+        return
     conn = snowflake.connector.connect(**SNOWFLAKE_CONN_PARAMS)
     cursor = conn.cursor()
-    for record in data:
-        cursor.execute("""
-            INSERT INTO your_table (symbol, sector, price, volume, timestamp, change_percent, market_cap, volatility)
-            VALUES (%(symbol)s, %(sector)s, %(price)s, %(volume)s, %(timestamp)s, %(change_percent)s, %(market_cap)s, %(volatility)s)
-        """, record)
+    # A per-load stage path keeps COPY from touching files left by other loads
+    stage = f'@%{table}/{uuid.uuid4().hex}'
+    with tempfile.TemporaryDirectory() as staging_dir:
+        for batch, start in enumerate(range(0, len(data), LOAD_BATCH_ROWS)):
+            path = os.path.join(staging_dir, f'{table}_{batch:05d}.csv.gz')
+            with gzip.open(path, 'wt', newline='') as f:
+                csv.writer(f).writerows(
+                    [record.get(column) for column in columns]
+                    for record in data[start:start + LOAD_BATCH_ROWS]
+                )
+        cursor.execute(f"PUT 'file://{staging_dir}/*.csv.gz' {stage} AUTO_COMPRESS=FALSE PARALLEL=8")
+    cursor.execute(
+        f"COPY INTO {table} ({', '.join(columns)}) FROM {stage} "
+        "FILE_FORMAT = (TYPE = CSV COMPRESSION = GZIP FIELD_OPTIONALLY_ENCLOSED_BY = '\"') PURGE = TRUE"
+    )
     conn.commit()
     cursor.close()
     conn.close()
 
-def etl_task():
-    s3_data = extract_from_s3()
+def etl_task(ds_nodash):
+    # Only the run's day partition, so earlier days are not loaded again
+    s3_data = extract_from_s3(f"{os.getenv('equity_prefix')}equity_data_{ds_nodash}")
     kafka_data = extract_from_kafka()
     combined_data = s3_data + kafka_data
     load_to_snowflake(combined_data)
 
+def commodity_etl_task(ds_nodash):
+    commodity_prefix = os.getenv('commodity_prefix')
+    if not commodity_prefix:
+        raise ValueError("commodity_prefix is not set")
+    # Only the run's day partition, so earlier days are not loaded again
+    commodity_data = extract_from_s3(f'{commodity_prefix}commodity_data_{ds_nodash}')
+    load_to_snowflake(commodity_data, COMMODITY_TABLE, COMMODITY_COLUMNS)
+
 etl = PythonOperator(
     task_id='etl_task',
     python_callable=etl_task,
+    op_kwargs={'ds_nodash': '{{ ds_nodash }}'},
+    dag=dag,
+)
+
+commodity_etl = PythonOperator(
+    task_id='commodity_etl_task',
+    python_callable=commodity_etl_task,
+    op_kwargs={'ds_nodash': '{{ ds_nodash }}'},
     dag=dag,
 )
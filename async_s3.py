@@ -0,0 +1,103 @@
+import asyncio
+import gzip
+import json
+import logging
+import os
+from typing import List, Dict, Any, Optional
+
+from aiobotocore.config import AioConfig
+from aiobotocore.session import get_session
+
+from config import S3_CONFIG
+
+# Async S3 client settings (size of the shared HTTP connection pool)
+ASYNC_S3_CONFIG = AioConfig(
+    max_pool_connections=int(os.getenv('s3_max_pool_connections', 50))
+)
+
+def create_async_s3_client():
+    """Create an aiobotocore S3 client; use it with `async with`"""
+    return get_session().create_client(
+        's3',
+        aws_access_key_id=os.getenv('access_key'),
+        aws_secret_access_key=os.getenv('secret_key'),
+        region_name=os.getenv('region'),
+        endpoint_url=os.getenv('s3_endpoint_url'),
+        config=ASYNC_S3_CONFIG
+    )
+
+class AsyncS3Client:
+    """Asyncio S3 client sharing one connection pool across all coroutines"""
+
+    def __init__(self, bucket_name: Optional[str] = None, max_concurrency: Optional[int] = None):
+        self.bucket_name = bucket_name or S3_CONFIG['bucket_name']
+        # Bounds in-flight requests so fan-outs never exceed the connection pool
+        self._semaphore = asyncio.Semaphore(
+            max_concurrency or ASYNC_S3_CONFIG.max_pool_connections
+        )
+        self._client_context = None
+        self._client = None
+
+    async def open(self) -> None:
+        """Create the underlying client and its connection pool"""
+        self._client_context = create_async_s3_client()
+        self._client = await self._client_context.__aenter__()
+
+    async def close(self) -> None:
+        """Close the client and release pooled connections"""
+        if self._client_context is not None:
+            await self._client_context.__aexit__(None, None, None)
+        self._client_context = None
+        self._client = None
+
+    async def __aenter__(self) -> 'AsyncS3Client':
+        await self.open()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
+
+    async def list_objects(self, prefix: str) -> List[Dict[str, Any]]:
+        """List all objects under a prefix, following pagination"""
+        objects = []
+        paginator = self._client.get_paginator('list_objects_v2')
+        async for page in paginator.paginate(Bucket=self.bucket_name, Prefix=prefix):
+            objects.extend(page.get('Contents', []))
+        return objects
+
+    async def get_json(self, key: str) -> Any:
+        """Download and decode a JSON object, decompressing gzip batches"""
+        async with self._semaphore:
+            response = await self._client.get_object(Bucket=self.bucket_name, Key=key)
+            async with response['Body'] as stream:
+                body = await stream.read()
+        if key.endswith('.gz'):
+            body = gzip.decompress(body)
+        return json.loads(body)
+
+    async def get_many_json(self, keys: List[str]) -> List[Any]:
+        """Download many JSON objects as parallel GETs on the running loop"""
+        return await asyncio.gather(*(self.get_json(key) for key in keys))
+
+    async def put_json(self, key: str, payload: Any, compress: bool = False) -> bool:
+        """Upload a JSON payload with error handling"""
+        try:
+            body = json.dumps(payload).encode('utf-8')
+            extra = {}
+            if compress:
+                body = gzip.compress(body)
+                extra['ContentEncoding'] = 'gzip'
+
+            async with self._semaphore:
+                await self._client.put_object(
+                    Bucket=self.bucket_name,
+                    Key=key,
+                    Body=body,
+                    ContentType='application/json',
+                    **extra
+                )
+            return True
+
+        except Exception as e:
+            logging.error(f"Error uploading {key} to S3: {str(e)}")
+            return False
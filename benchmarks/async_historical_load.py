@@ -0,0 +1,147 @@
+"""
+Benchmark concurrent historical requests against the Flask and ASGI equity APIs.
+
+Both apps are served locally and read from a moto S3 server seeded with
+one equity file per day, so the run needs no AWS credentials or network.
+
+Two scenarios run against each app with identical requests. "single"
+sends one date per request. "multi" sends --dates-per-request dates as one
+comma-separated request, which Flask fans out on its thread pool and the
+ASGI app on its event loop. Results are days served per second, with the
+ASGI/Flask ratio per scenario; a ratio below 1 means Flask was faster.
+
+    python benchmarks/async_historical_load.py --days 30 --requests 500 --concurrency 50 --dates-per-request 10
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from datetime import datetime, timedelta
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(BENCHMARKS_DIR)
+sys.path.append(BENCHMARKS_DIR)
+sys.path.append(ROOT)
+sys.path.append(os.path.join(ROOT, 'equity'))
+
+from fakes import free_port, start_s3_server
+
+def seed_days(days: int):
+    """Upload one equity file per day and return the dates written"""
+    from config import s3_client, S3_CONFIG
+    from equity_common import generate_stock_data
+
+    s3_client.create_bucket(Bucket=S3_CONFIG['bucket_name'])
+    dates = []
+    start = datetime.now() - timedelta(days=days)
+    for offset in range(days):
+        date = (start + timedelta(days=offset)).strftime('%Y%m%d')
+        data = generate_stock_data()
+        s3_client.put_object(
+            Bucket=S3_CONFIG['bucket_name'],
+            Key=f"{S3_CONFIG['equity_prefix']}equity_data_{date}_000000.json",
+            Body=json.dumps({'timestamp': date, 'record_count': len(data), 'data': data})
+        )
+        dates.append(date)
+    return dates
+
+def serve_flask() -> int:
+    from werkzeug.serving import make_server
+    from equity_api import app
+
+    port = free_port()
+    server = make_server('127.0.0.1', port, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return port
+
+def serve_asgi() -> int:
+    from hypercorn.asyncio import serve
+    from hypercorn.config import Config
+    from equity_asgi_api import app
+
+    port = free_port()
+    config = Config()
+    config.bind = [f'127.0.0.1:{port}']
+    config.accesslog = None
+    # A shutdown trigger stops hypercorn from installing signal handlers off the main thread
+    run = lambda: asyncio.run(serve(app, config, shutdown_trigger=lambda: asyncio.Future()))
+    threading.Thread(target=run, daemon=True).start()
+    return port
+
+async def wait_until_up(session, url: str) -> None:
+    for _ in range(100):
+        try:
+            async with session.get(url) as response:
+                await response.read()
+                return
+        except Exception:
+            await asyncio.sleep(0.1)
+    raise RuntimeError(f'Server at {url} did not start')
+
+async def run_load(port: int, dates, requests: int, concurrency: int,
+                   dates_per_request: int = 1) -> float:
+    """Issue historical requests with bounded concurrency, return days served/sec"""
+    import aiohttp
+
+    base_url = f'http://127.0.0.1:{port}/api/equity/historical'
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def get(session, date: str) -> None:
+        async with session.get(base_url, params={'date': date}) as response:
+            await response.read()
+            if response.status != 200:
+                raise RuntimeError(f'{base_url} returned {response.status}')
+
+    async def one_request(session, index: int) -> None:
+        wanted = [dates[(index + offset) % len(dates)] for offset in range(dates_per_request)]
+        async with semaphore:
+            await get(session, ','.join(wanted))
+
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        await wait_until_up(session, f'{base_url}?date={dates[0]}')
+        started = time.perf_counter()
+        await asyncio.gather(*(one_request(session, i) for i in range(requests)))
+        return requests * dates_per_request / (time.perf_counter() - started)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--days', type=int, default=30)
+    parser.add_argument('--requests', type=int, default=500)
+    parser.add_argument('--concurrency', type=int, default=50)
+    parser.add_argument('--dates-per-request', type=int, default=10)
+    args = parser.parse_args()
+
+    server = start_s3_server()
+    try:
+        dates = seed_days(args.days)
+        flask_port, asgi_port = serve_flask(), serve_asgi()
+        # After the apps' basicConfig; werkzeug logs every request through its own logger
+        logging.getLogger().setLevel(logging.ERROR)
+        logging.getLogger('werkzeug').setLevel(logging.ERROR)
+        load = (dates, args.requests, args.concurrency)
+        multi = args.dates_per_request
+        results = {
+            'single': {
+                'flask': asyncio.run(run_load(flask_port, *load)),
+                'asgi': asyncio.run(run_load(asgi_port, *load))
+            },
+            'multi': {
+                'flask': asyncio.run(run_load(flask_port, *load, dates_per_request=multi)),
+                'asgi': asyncio.run(run_load(asgi_port, *load, dates_per_request=multi))
+            }
+        }
+    finally:
+        server.stop()
+
+    for scenario, rates in results.items():
+        for name, rate in rates.items():
+            print(f'{scenario:>6} {name:>6}: {rate:8.1f} days/sec')
+        print(f'{scenario:>6}  ratio: {rates["asgi"] / rates["flask"]:.2f}x (asgi/flask)')
+
+if __name__ == '__main__':
+    main()
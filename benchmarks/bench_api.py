@@ -0,0 +1,30 @@
+"""Equity API throughput through the Flask test client, in requests per second"""
+
+def bench_current_prices(benchmark, throughput, equity_api):
+    with equity_api.data_lock:
+        equity_api.current_equity_data = {
+            item['symbol']: item for item in equity_api.generate_stock_data()
+        }
+    client = equity_api.app.test_client()
+    response = benchmark(client.get, '/api/equity/current')
+    assert response.status_code == 200
+    throughput('requests_per_sec', 1)
+
+def bench_historical_date(benchmark, throughput, equity_api, equity_files):
+    day, _ = equity_files
+    client = equity_api.app.test_client()
+    response = benchmark(client.get, f'/api/equity/historical?date={day}&symbol=AAPL')
+    assert response.status_code == 200
+    throughput('requests_per_sec', 1)
+
+def bench_historical_range(benchmark, throughput, equity_api, equity_files):
+    day, _ = equity_files
+    client = equity_api.app.test_client()
+
+    def request_range():
+        response = client.get(f'/api/equity/historical?from={day}&to={day}&interval=1min')
+        return response.status_code, response.get_data()
+
+    status, body = benchmark(request_range)
+    assert status == 200 and body
+    throughput('requests_per_sec', 1)
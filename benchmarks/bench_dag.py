@@ -0,0 +1,31 @@
+"""ETL DAG throughput: S3 extract in MB/s, Kafka extract and Snowflake load in rows/s"""
+import json
+import os
+
+import fakes
+
+def bench_extract_from_s3(benchmark, throughput, dag, equity_files):
+    day, total_bytes = equity_files
+    prefix = f"{os.environ['equity_prefix']}equity_data_{day}"
+    data = benchmark(dag.extract_from_s3, prefix)
+    assert data
+    throughput('mb_per_sec', total_bytes / 1e6)
+
+def bench_extract_from_kafka(benchmark, throughput, dag, equity_api):
+    records = [row for _ in range(100) for row in equity_api.generate_stock_data()]
+
+    def publish():
+        fakes.broker.reset()
+        producer = fakes.FakeKafkaProducer(value_serializer=lambda x: json.dumps(x).encode('utf-8'))
+        for record in records:
+            producer.send('your_topic', record)
+
+    data = benchmark.pedantic(dag.extract_from_kafka, setup=publish, rounds=20)
+    assert len(data) == len(records)
+    throughput('rows_per_sec', len(records))
+
+def bench_load_to_snowflake(benchmark, throughput, dag, equity_api):
+    records = [row for _ in range(500) for row in equity_api.generate_stock_data()]
+    benchmark(dag.load_to_snowflake, records)
+    assert fakes.count_rows(dag.EQUITY_TABLE) >= len(records)
+    throughput('rows_per_sec', len(records))
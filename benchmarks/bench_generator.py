@@ -0,0 +1,12 @@
+"""Tick generation throughput of the equity API and the standalone generator"""
+
+def bench_api_generate_stock_data(benchmark, throughput, equity_api):
+    data = benchmark(equity_api.generate_stock_data)
+    throughput('ticks_per_sec', len(data))
+
+def bench_generator_generate_stock_data(benchmark, throughput):
+    from equity_generator import EquityDataGenerator
+
+    generator = EquityDataGenerator()
+    data = benchmark(generator.generate_stock_data)
+    throughput('ticks_per_sec', len(data))
@@ -0,0 +1,27 @@
+"""S3 upload throughput against the moto server, in objects per second"""
+
+def bench_equity_upload_to_s3(benchmark, throughput, equity_api):
+    data = equity_api.generate_stock_data()
+    assert benchmark(equity_api.upload_to_s3, data)
+    throughput('objects_per_sec', 1)
+
+def bench_generator_upload_to_s3(benchmark, throughput):
+    from equity_generator import EquityDataGenerator
+
+    generator = EquityDataGenerator()
+    data = generator.generate_stock_data()
+    assert benchmark(generator.upload_to_s3, data)
+    throughput('objects_per_sec', 1)
+
+def bench_commodity_upload_to_s3(benchmark, throughput):
+    import commodity_api
+
+    # One minute of ticks for every commodity, the default batch size
+    ticks = [
+        {'stock_name': name, 'base_price': price, 'current_price': price,
+         'timestamp': f'2024-01-02T00:00:{second:02d}'}
+        for second in range(60)
+        for name, price in commodity_api.base_prices.items()
+    ]
+    assert benchmark(commodity_api.upload_to_s3, ticks)
+    throughput('objects_per_sec', 1)
@@ -0,0 +1,125 @@
+"""
+Shared fixtures for the offline benchmark suite.
+
+S3 is a moto server, Kafka and Snowflake are the in-process fakes from
+`fakes.py`. Save a baseline with --benchmark-save=baseline. Runs with
+--benchmark-compare=baseline are checked against the newest saved baseline.
+They fail when any benchmark's median is more than BENCHMARK_MAX_SLOWDOWN
+percent (default 30) slower.
+"""
+import importlib.util
+import json
+import os
+import sys
+from pathlib import Path
+
+import pytest
+from pytest_benchmark.utils import PercentageRegressionCheck
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(BENCHMARKS_DIR)
+sys.path.append(BENCHMARKS_DIR)
+sys.path.append(ROOT)
+sys.path.append(os.path.join(ROOT, 'equity'))
+sys.path.append(os.path.join(ROOT, 'commodity'))
+
+import fakes
+
+def latest_baseline(config) -> str:
+    """Path of the newest results saved with --benchmark-save=baseline"""
+    storage = config.getoption('benchmark_storage')
+    path = Path(storage[len('file://'):] if storage.startswith('file://') else storage)
+    saved = sorted(path.glob('*/*_baseline.json'), key=lambda file: file.name)
+    if not saved:
+        raise pytest.UsageError(
+            f"No baseline in {path}; run `pytest benchmarks --benchmark-save=baseline` first"
+        )
+    return str(saved[-1])
+
+def max_slowdown() -> float:
+    value = os.getenv('BENCHMARK_MAX_SLOWDOWN', '30')
+    try:
+        slowdown = float(value)
+    except ValueError:
+        slowdown = -1
+    if slowdown <= 0:
+        raise pytest.UsageError(f"BENCHMARK_MAX_SLOWDOWN must be a positive percentage, got {value!r}")
+    return slowdown
+
+# pytest-benchmark's own default, which resolves against the working directory
+DEFAULT_STORAGE = 'file://./.benchmarks'
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_configure(config):
+    if config.getoption('benchmark_storage') == DEFAULT_STORAGE:
+        # Keep saved runs in benchmarks/.results wherever pytest is started from
+        config.option.benchmark_storage = f"file://{os.path.join(BENCHMARKS_DIR, '.results')}"
+    if config.getoption('benchmark_compare') == 'baseline':
+        config.option.benchmark_compare = latest_baseline(config)
+    if config.getoption('benchmark_compare') and not config.getoption('benchmark_compare_fail'):
+        # Median is far less sensitive than mean to scheduler and GC outliers
+        config.option.benchmark_compare_fail = [PercentageRegressionCheck('median', max_slowdown())]
+
+@pytest.fixture(scope='session', autouse=True)
+def s3_server(tmp_path_factory):
+    """Moto S3 server with the repo's bucket created; repo modules import after this"""
+    os.environ['AIRFLOW_HOME'] = str(tmp_path_factory.mktemp('airflow'))
+    os.environ['AIRFLOW__CORE__LOAD_EXAMPLES'] = 'False'
+    server = fakes.start_s3_server()
+
+    from config import s3_client, S3_CONFIG
+    s3_client.create_bucket(Bucket=S3_CONFIG['bucket_name'])
+    yield server
+    server.stop()
+
+@pytest.fixture(scope='session')
+def equity_api():
+    import equity_api
+    return equity_api
+
+@pytest.fixture(scope='session')
+def dag(tmp_path_factory):
+    """The ETL DAG module wired to fake Kafka and a SQLite-backed fake Snowflake"""
+    fakes.install()
+    spec = importlib.util.spec_from_file_location(
+        'etl_pipeline', os.path.join(ROOT, 'airflow', 'dags', 'etl_pipeline.py')
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    fakes.create_tables(tmp_path_factory.mktemp('snowflake') / 'warehouse.db', {
+        module.EQUITY_TABLE: module.EQUITY_COLUMNS,
+        module.COMMODITY_TABLE: module.COMMODITY_COLUMNS
+    })
+    return module
+
+@pytest.fixture(scope='session')
+def equity_files(equity_api):
+    """Seed one day of equity files; returns (day, total bytes stored)"""
+    from config import s3_client, S3_CONFIG
+
+    day = '20240102'
+    total_bytes = 0
+    for second in range(200):
+        data = equity_api.generate_stock_data()
+        timestamp = f'{day}T{second // 3600:02d}:{second // 60 % 60:02d}:{second % 60:02d}'
+        for row in data:
+            row['timestamp'] = timestamp
+        body = json.dumps({'timestamp': timestamp, 'record_count': len(data), 'data': data})
+        s3_client.put_object(
+            Bucket=S3_CONFIG['bucket_name'],
+            Key=f"{S3_CONFIG['equity_prefix']}equity_data_{day}_{second:06d}.json",
+            Body=body
+        )
+        total_bytes += len(body)
+    return day, total_bytes
+
+@pytest.fixture
+def throughput(benchmark):
+    """Record units processed per second of the median round in the saved results"""
+    def record(name, units):
+        # No timings are kept under --benchmark-disable or when xdist turns benchmarking off
+        if benchmark.disabled or benchmark.stats is None:
+            return
+        benchmark.extra_info[name] = round(units / benchmark.stats.stats.median, 1)
+    return record
@@ -0,0 +1,209 @@
+"""
+Local stand-ins for S3, Kafka and the Snowflake connector.
+
+`start_s3_server()` runs moto in a thread and points the repo's S3
+configuration at it. `install()` registers the in-process Kafka and
+Snowflake fakes under the `kafka` and `snowflake.connector` module names,
+so the DAG imports them unchanged and the suite runs with no brokers,
+warehouses or network access.
+"""
+import csv
+import glob
+import gzip
+import os
+import re
+import socket
+import sqlite3
+import sys
+import types
+from collections import defaultdict
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+def start_s3_server():
+    """Start a moto S3 server and point the repo's S3 configuration at it"""
+    from moto.server import ThreadedMotoServer
+
+    port = free_port()
+    server = ThreadedMotoServer(ip_address='127.0.0.1', port=port, verbose=False)
+    server.start()
+
+    os.environ.update({
+        's3_endpoint_url': f'http://127.0.0.1:{port}',
+        'access_key': 'testing',
+        'secret_key': 'testing',
+        'region': 'us-east-1',
+        'bucket': 'benchmark-bucket',
+        'equity_prefix': 'equity-data/',
+        'commodity_prefix': 'commodity-data/',
+        'equity_asgi_generate': '0'
+    })
+    return server
+
+class FakeKafkaBroker:
+    """Topics held in memory as lists of raw message bytes"""
+
+    def __init__(self):
+        self.topics = defaultdict(list)
+        self.committed = defaultdict(int)
+
+    def reset(self):
+        self.topics.clear()
+        self.committed.clear()
+
+broker = FakeKafkaBroker()
+
+class FakeKafkaMessage:
+    def __init__(self, topic, offset, value):
+        self.topic = topic
+        self.offset = offset
+        self.value = value
+
+class FakeKafkaProducer:
+    def __init__(self, value_serializer=None, **kwargs):
+        self.value_serializer = value_serializer
+
+    def send(self, topic, value):
+        if self.value_serializer:
+            value = self.value_serializer(value)
+        broker.topics[topic].append(value)
+
+    def flush(self):
+        pass
+
+class FakeKafkaConsumer:
+    """
+    Yields messages from the group's committed offset to the end of the topic.
+
+    Like a real consumer, iteration only ends when `consumer_timeout_ms` is
+    set. Without it a real consumer blocks forever, so the fake raises
+    instead. The fake stops as soon as the topic is drained and does not
+    sleep for the idle timeout, so benchmarks leave that wait out.
+    """
+
+    def __init__(self, *topics, group_id=None, value_deserializer=None, consumer_timeout_ms=None, **kwargs):
+        self.topics = topics
+        self.group_id = group_id
+        self.value_deserializer = value_deserializer
+        self.consumer_timeout_ms = consumer_timeout_ms
+
+    def __iter__(self):
+        for topic in self.topics:
+            key = (self.group_id, topic)
+            messages = broker.topics[topic]
+            for offset in range(broker.committed[key], len(messages)):
+                value = messages[offset]
+                if self.value_deserializer:
+                    value = self.value_deserializer(value)
+                yield FakeKafkaMessage(topic, offset, value)
+            broker.committed[key] = len(messages)
+
+        if self.consumer_timeout_ms is None:
+            raise RuntimeError("KafkaConsumer without consumer_timeout_ms never stops iterating")
+
+# Staged file contents by stage path, filled by PUT and drained by COPY INTO
+stages = defaultdict(list)
+
+class FakeSnowflakeCursor:
+    """
+    DB-API cursor that rewrites Snowflake pyformat binds for SQLite.
+
+    `PUT 'file://...' @stage` and `COPY INTO table (cols) FROM @stage` for
+    gzip CSV files are emulated in memory, so bulk loads land in SQLite.
+    """
+
+    PYFORMAT = re.compile(r'%\((\w+)\)s')
+    PUT = re.compile(r"^PUT 'file://(?P<pattern>[^']+)' (?P<stage>@\S+)", re.IGNORECASE)
+    COPY = re.compile(r'^COPY INTO (?P<table>\w+) \((?P<columns>[^)]*)\) FROM (?P<stage>@\S+)', re.IGNORECASE)
+
+    def __init__(self, connection):
+        self._cursor = connection.cursor()
+
+    def _translate(self, sql):
+        return self.PYFORMAT.sub(r':\1', sql)
+
+    def _put(self, pattern, stage):
+        for path in sorted(glob.glob(pattern)):
+            with open(path, 'rb') as f:
+                stages[stage].append(f.read())
+
+    def _copy(self, table, columns, stage):
+        columns = [column.strip() for column in columns.split(',')]
+        sql = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' for _ in columns)})"
+        for body in stages.pop(stage, []):
+            rows = csv.reader(gzip.decompress(body).decode('utf-8').splitlines())
+            # Snowflake loads empty CSV fields as NULL
+            self._cursor.executemany(sql, ([value or None for value in row] for row in rows))
+
+    def execute(self, sql, params=None):
+        statement = sql.strip()
+        put, copy = self.PUT.match(statement), self.COPY.match(statement)
+        if put:
+            self._put(put['pattern'], put['stage'])
+        elif copy:
+            self._copy(copy['table'], copy['columns'], copy['stage'])
+        else:
+            self._cursor.execute(self._translate(sql), params or {})
+        return self
+
+    def executemany(self, sql, seq_of_params):
+        self._cursor.executemany(self._translate(sql), seq_of_params)
+        return self
+
+    def fetchall(self):
+        return self._cursor.fetchall()
+
+    def close(self):
+        self._cursor.close()
+
+class FakeSnowflakeConnection:
+    database_path = ':memory:'
+
+    def __init__(self, **kwargs):
+        self._connection = sqlite3.connect(self.database_path)
+
+    def cursor(self):
+        return FakeSnowflakeCursor(self._connection)
+
+    def commit(self):
+        self._connection.commit()
+
+    def close(self):
+        self._connection.close()
+
+def connect(**kwargs):
+    return FakeSnowflakeConnection(**kwargs)
+
+def create_tables(database_path, tables):
+    """Point the fake connector at a SQLite file and create the target tables"""
+    FakeSnowflakeConnection.database_path = str(database_path)
+    connection = sqlite3.connect(FakeSnowflakeConnection.database_path)
+    for table, columns in tables.items():
+        connection.execute(f"CREATE TABLE IF NOT EXISTS {table} ({', '.join(columns)})")
+    connection.commit()
+    connection.close()
+
+def count_rows(table):
+    connection = sqlite3.connect(FakeSnowflakeConnection.database_path)
+    try:
+        return connection.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+    finally:
+        connection.close()
+
+def install():
+    """Register the fakes as the `kafka` and `snowflake.connector` modules"""
+    kafka = types.ModuleType('kafka')
+    kafka.KafkaConsumer = FakeKafkaConsumer
+    kafka.KafkaProducer = FakeKafkaProducer
+
+    snowflake = types.ModuleType('snowflake')
+    connector = types.ModuleType('snowflake.connector')
+    connector.connect = connect
+    snowflake.connector = connector
+
+    sys.modules['kafka'] = kafka
+    sys.modules['snowflake'] = snowflake
+    sys.modules['snowflake.connector'] = connector
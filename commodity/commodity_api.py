@@ -3,8 +3,13 @@ import random
 import time
 import threading
 from datetime import datetime
+import gzip
+import json
+import logging
+from typing import List, Dict, Any
 import sys
 import os
+import uuid
 
 # Add the parent directory to the system path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -13,6 +18,21 @@ from config import s3_client, S3_CONFIG
 
 app = Flask(__name__)
 
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+
+# Seconds of ticks collected into a single S3 object
+BATCH_INTERVAL = int(os.getenv('commodity_batch_interval', 60))
+
+# Most ticks written to one S3 object, so retried backlogs upload in pieces
+MAX_BATCH_TICKS = int(os.getenv('commodity_max_batch_ticks', 5000))
+
+# Most ticks kept while S3 is failing; the oldest are dropped beyond this
+MAX_PENDING_TICKS = int(os.getenv('commodity_max_pending_ticks', 100000))
+
 # Base prices for different commodity stocks
 base_prices = {
     "GOLD": 1800.0,  # Base price for Gold
@@ -26,10 +46,15 @@ base_prices = {
 current_stock_data = {}
 data_lock = threading.Lock()
 
+# Ticks waiting to be flushed to S3
+pending_ticks = []
+batch_lock = threading.Lock()
+
 def update_stock_prices():
     """Background task to update stock prices every second"""
     while True:
         with data_lock:
+            ticks = []
             for stock_name, base_price in base_prices.items():
                 price_variation = random.uniform(-0.10, 0.10)
                 current_price = base_price * (1 + price_variation)
@@ -40,8 +65,72 @@ def update_stock_prices():
                     "current_price": round(current_price, 2),
                     "timestamp": datetime.now().isoformat()
                 }
+                ticks.append(current_stock_data[stock_name])
+
+        with batch_lock:
+            pending_ticks.extend(ticks)
         time.sleep(1)  # Update every second
 
+def upload_to_s3(data: List[Dict[str, Any]]) -> bool:
+    """Upload a batch of commodity ticks to S3 as gzip-compressed JSON"""
+    try:
+        # Name the object after its first tick so retried batches keep their day partition
+        timestamp = datetime.fromisoformat(data[0]['timestamp']).strftime('%Y%m%d_%H%M%S')
+        # Suffix keeps keys unique when several uploaders flush in the same second
+        filename = f'commodity_data_{timestamp}_{uuid.uuid4().hex[:8]}.json.gz'
+
+        # Add metadata
+        payload = {
+            'timestamp': datetime.now().isoformat(),
+            'record_count': len(data),
+            'data': data
+        }
+
+        s3_client.put_object(
+            Bucket=S3_CONFIG['bucket_name'],
+            Key=f"{S3_CONFIG['commodity_prefix']}{filename}",
+            Body=gzip.compress(json.dumps(payload).encode('utf-8')),
+            ContentType='application/json',
+            ContentEncoding='gzip'
+        )
+
+        logging.info(f"Successfully uploaded {filename} ({len(data)} ticks) to S3 path: {S3_CONFIG['commodity_prefix']}")
+        return True
+
+    except Exception as e:
+        logging.error(f"Error uploading to S3: {str(e)}")
+        return False
+
+def split_batch(batch: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+    """Split ticks into uploads of at most MAX_BATCH_TICKS that never span two days"""
+    uploads = []
+    for tick in batch:
+        day = tick['timestamp'][:10]
+        if not uploads or len(uploads[-1]) >= MAX_BATCH_TICKS or uploads[-1][0]['timestamp'][:10] != day:
+            uploads.append([])
+        uploads[-1].append(tick)
+    return uploads
+
+def flush_commodity_batches():
+    """Background task to upload buffered ticks once per batch interval"""
+    global pending_ticks
+    while True:
+        time.sleep(BATCH_INTERVAL)
+
+        # Swap the buffer so the tick loop is never blocked by the upload
+        with batch_lock:
+            batch, pending_ticks = pending_ticks, []
+
+        failed = [tick for upload in split_batch(batch) if not upload_to_s3(upload) for tick in upload]
+        if failed:
+            # Keep the ticks for the next interval, but never grow without bound
+            with batch_lock:
+                pending_ticks = failed + pending_ticks
+                dropped = len(pending_ticks) - MAX_PENDING_TICKS
+                if dropped > 0:
+                    del pending_ticks[:dropped]
+                    logging.error(f"Dropped {dropped} oldest commodity ticks after repeated upload failures")
+
 @app.route('/update_stock', methods=['POST'])
 def update_stock():
     """Endpoint to manually update stock data"""
@@ -85,4 +174,9 @@ if __name__ == '__main__':
     update_thread = threading.Thread(target=update_stock_prices, daemon=True)
     update_thread.start()
 
-    app.run(debug=True)
+    # Start the S3 batch upload task
+    flush_thread = threading.Thread(target=flush_commodity_batches, daemon=True)
+    flush_thread.start()
+
+    # The reloader would rerun this block in a second process with its own tick generator
+    app.run(debug=True, use_reloader=False)
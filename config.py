@@ -10,7 +10,8 @@ s3_client = boto3.client(
     's3',
     aws_access_key_id=os.getenv('access_key'),
     aws_secret_access_key=os.getenv('secret_key'),
-    region_name=os.getenv('region')
+    region_name=os.getenv('region'),
+    endpoint_url=os.getenv('s3_endpoint_url')
 )
 
 # S3 Configuration
@@ -1,12 +1,13 @@
-from flask import Flask, jsonify, request
+from flask import Flask, Response, jsonify, request
 from flasgger import Swagger
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import json
 import threading
 import time
-import numpy as np
+import pandas as pd
 import logging
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator, Set
 import sys
 import os
 
@@ -14,6 +15,10 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from config import s3_client, S3_CONFIG
+from equity_common import (
+    PARTIAL_COLUMNS, RANGE_FETCH_BATCH, bars_to_ndjson, finalize_bars, generate_stock_data, merge_bars,
+    parse_range_args, partial_bars
+)
 
 app = Flask(__name__)
 swagger = Swagger(app)
@@ -24,56 +29,12 @@ logging.basicConfig(
     format='%(asctime)s - %(levelname)s - %(message)s'
 )
 
-# Define stock parameters
-stocks = {
-    'AAPL': {'base_price': 150.0, 'volatility': 0.02, 'sector': 'Technology'},
-    'GOOGL': {'base_price': 2800.0, 'volatility': 0.025, 'sector': 'Technology'},
-    'MSFT': {'base_price': 300.0, 'volatility': 0.018, 'sector': 'Technology'},
-    'AMZN': {'base_price': 3300.0, 'volatility': 0.03, 'sector': 'Consumer'},
-    'META': {'base_price': 330.0, 'volatility': 0.028, 'sector': 'Technology'},
-    'TSLA': {'base_price': 250.0, 'volatility': 0.035, 'sector': 'Automotive'},
-    'JPM': {'base_price': 140.0, 'volatility': 0.015, 'sector': 'Finance'},
-    'V': {'base_price': 200.0, 'volatility': 0.012, 'sector': 'Finance'},
-    'WMT': {'base_price': 150.0, 'volatility': 0.010, 'sector': 'Retail'},
-    'PG': {'base_price': 140.0, 'volatility': 0.008, 'sector': 'Consumer'}
-}
-
 current_equity_data = {}
 data_lock = threading.Lock()
 
-def generate_stock_data() -> List[Dict[str, Any]]:
-    """Generate current stock data with price movements"""
-    current_time = datetime.now()
-    stock_data = []
-
-    for symbol, info in stocks.items():
-        try:
-            # Generate random price movement
-            price_change = np.random.normal(0, info['volatility'])
-            new_price = info['base_price'] * (1 + price_change)
-
-            # Update base price for next iteration (with mean reversion)
-            stocks[symbol]['base_price'] = new_price * 0.9 + info['base_price'] * 0.1
-
-            # Generate realistic volume based on price
-            base_volume = int(1000000 / new_price)  # Higher for lower-priced stocks
-            volume = int(np.random.normal(base_volume, base_volume * 0.2))
-
-            stock_data.append({
-                'symbol': symbol,
-                'sector': info['sector'],
-                'price': round(new_price, 2),
-                'volume': max(0, volume),
-                'timestamp': current_time.isoformat(),
-                'change_percent': round(price_change * 100, 2),
-                'market_cap': round(new_price * volume, 2),
-                'volatility': round(info['volatility'] * 100, 2)
-            })
-
-        except Exception as e:
-            logging.error(f"Error generating data for {symbol}: {str(e)}")
-
-    return stock_data
+# S3 requests in flight for multi-day and range queries
+S3_FETCH_WORKERS = int(os.getenv('S3_FETCH_WORKERS', 16))
+s3_executor = ThreadPoolExecutor(max_workers=S3_FETCH_WORKERS)
 
 def upload_to_s3(data: List[Dict[str, Any]]) -> bool:
     """Upload stock data to S3 with error handling"""
@@ -90,7 +51,7 @@ def upload_to_s3(data: List[Dict[str, Any]]) -> bool:
 
         s3_client.put_object(
             Bucket=S3_CONFIG['bucket_name'],
-            Key=f'{S3_CONFIG['equity_prefix']}{filename}',
+            Key=f"{S3_CONFIG['equity_prefix']}{filename}",
             Body=json.dumps(payload),
             ContentType='application/json'
         )
@@ -102,6 +63,68 @@ def upload_to_s3(data: List[Dict[str, Any]]) -> bool:
         logging.error(f"Error uploading to S3: {str(e)}")
         return False
 
+def fetch_records(key: str) -> List[Dict[str, Any]]:
+    """Download one equity file from S3 and return its rows"""
+    obj = s3_client.get_object(Bucket=S3_CONFIG['bucket_name'], Key=key)
+    return json.loads(obj['Body'].read())['data']
+
+def list_day_keys(date: str) -> List[str]:
+    """List the keys of every equity file uploaded on a given day"""
+    paginator = s3_client.get_paginator('list_objects_v2')
+    return [
+        obj['Key']
+        for page in paginator.paginate(
+            Bucket=S3_CONFIG['bucket_name'],
+            Prefix=f"{S3_CONFIG['equity_prefix']}equity_data_{date}"
+        )
+        for obj in page.get('Contents', [])
+    ]
+
+def fetch_latest_day(date: str) -> List[Dict[str, Any]]:
+    """Fetch the rows of the latest equity file uploaded on a given day"""
+    response = s3_client.list_objects_v2(
+        Bucket=S3_CONFIG['bucket_name'],
+        Prefix=f"{S3_CONFIG['equity_prefix']}equity_data_{date}"
+    )
+    if 'Contents' not in response:
+        return []
+    latest_file = sorted(response['Contents'], key=lambda x: x['LastModified'])[-1]
+    return fetch_records(latest_file['Key'])
+
+def iter_range_bars(dates: List[str], interval: str, symbols: Set[str]) -> Iterator[pd.DataFrame]:
+    """
+    Yield each day's bars, skipping days without data.
+
+    A day's files are fetched RANGE_FETCH_BATCH at a time and each batch is
+    reduced to partial bars before the next one is fetched, so memory holds
+    one batch of ticks plus one day of bars however long the range is.
+    """
+    previous_close = {}
+    for date in dates:
+        # Keys embed the upload time, so sorted batches merge in tick order
+        keys = sorted(list_day_keys(date))
+        day = pd.DataFrame(columns=PARTIAL_COLUMNS)
+        for start in range(0, len(keys), RANGE_FETCH_BATCH):
+            batch = keys[start:start + RANGE_FETCH_BATCH]
+            records = [row for rows in s3_executor.map(fetch_records, batch) for row in rows]
+            day = merge_bars([day, partial_bars(records, interval, symbols)])
+
+        bars = finalize_bars(day, previous_close)
+        if not bars.empty:
+            previous_close.update(bars.groupby('symbol')['close'].last().to_dict())
+            yield bars
+
+def stream_range_aggregates(first_bars: pd.DataFrame, remaining: Iterator[pd.DataFrame]) -> Iterator[str]:
+    """Stream bars as NDJSON, ending with an error line if a later day fails"""
+    yield bars_to_ndjson(first_bars)
+    try:
+        for bars in remaining:
+            yield bars_to_ndjson(bars)
+    except Exception as e:
+        # Headers are already sent, so report the failure in the body
+        logging.error(f"Error aggregating historical range: {str(e)}")
+        yield json.dumps({"error": str(e)}) + '\n'
+
 def update_equity_data():
     """Background task to continuously update equity data"""
     global current_equity_data
@@ -176,15 +199,35 @@ def get_historical_data():
         in: query
         type: string
         required: false
-        description: The symbol of the equity
+        description: The symbol of the equity, or a comma-separated list
       - name: date
         in: query
         type: string
         required: false
-        description: The date of the historical data in YYYYMMDD format
+        description: The date of the historical data in YYYYMMDD format, or a comma-separated list
+      - name: from
+        in: query
+        type: string
+        required: false
+        description: >
+          First day of a range query in YYYYMMDD format; switches the response
+          to aggregated bars. Ranges span at most historical_max_range_days (default 366)
+      - name: to
+        in: query
+        type: string
+        required: false
+        description: Last day of a range query in YYYYMMDD format (defaults to from)
+      - name: interval
+        in: query
+        type: string
+        required: false
+        description: Bar size for range queries as a pandas offset alias that divides one day (default 1h)
     responses:
       200:
-        description: A list of historical equity data
+        description: >
+          A list of historical equity data, or for range queries a newline-delimited
+          JSON stream of bars with symbol, timestamp, open, high, low, close,
+          mean_volume and return
         schema:
           type: array
           items:
@@ -206,34 +249,48 @@ def get_historical_data():
                 type: number
               volatility:
                 type: number
+      400:
+        description: Invalid range query parameters
       404:
-        description: No data found for symbol or date
+        description: No data found for symbol, date or range
+      500:
+        description: >
+          S3 or aggregation error. If a range stream fails after it has started,
+          the last NDJSON line is an object with an error field instead.
     """
-    symbol = request.args.get('symbol', '').upper()
-    date = request.args.get('date', datetime.now().strftime('%Y%m%d'))
+    if 'from' in request.args:
+        try:
+            dates, interval, symbols = parse_range_args(request.args)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
 
-    try:
-        response = s3_client.list_objects_v2(
-            Bucket=S3_CONFIG['bucket_name'],
-            Prefix=f"{S3_CONFIG['equity_prefix']}equity_data_{date}"
-        )
+        # Read up to the first day with data so an empty range can still 404
+        bars = iter_range_bars(dates, interval, symbols)
+        try:
+            first_bars = next(bars, None)
+        except Exception as e:
+            return jsonify({"error": str(e)}), 500
+        if first_bars is None:
+            return jsonify({"error": "No historical data found"}), 404
+        return Response(stream_range_aggregates(first_bars, bars), mimetype='application/x-ndjson')
 
-        if 'Contents' in response:
-            latest_file = sorted(response['Contents'], key=lambda x: x['LastModified'])[-1]
-            obj = s3_client.get_object(
-                Bucket=S3_CONFIG['bucket_name'],
-                Key=latest_file['Key']
-            )
-            data = json.loads(obj['Body'].read())
+    symbols = {s for s in request.args.get('symbol', '').upper().split(',') if s}
+    dates = request.args.get('date', datetime.now().strftime('%Y%m%d')).split(',')
+
+    try:
+        # Each date is a separate S3 list and GET, fetched in parallel
+        days = list(s3_executor.map(fetch_latest_day, dates))
+        data = [item for day in days for item in day]
 
-            if symbol:
-                data = [item for item in data if item['symbol'] == symbol]
-                if not data:
-                    return jsonify({"error": "No data found for symbol"}), 404
+        if not data:
+            return jsonify({"error": "No historical data found"}), 404
 
-            return jsonify(data)
+        if symbols:
+            data = [item for item in data if item['symbol'] in symbols]
+            if not data:
+                return jsonify({"error": "No data found for symbol"}), 404
 
-        return jsonify({"error": "No historical data found"}), 404
+        return jsonify(data)
 
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -0,0 +1,195 @@
+from quart import Quart, Response, jsonify, request
+from datetime import datetime
+import asyncio
+import json
+import logging
+import pandas as pd
+from typing import List, Dict, Any, AsyncIterator, Set
+import sys
+import os
+
+# Add the parent directory to the system path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import S3_CONFIG
+from async_s3 import AsyncS3Client
+from equity_common import (
+    PARTIAL_COLUMNS, RANGE_FETCH_BATCH, bars_to_ndjson, finalize_bars, generate_stock_data, merge_bars,
+    parse_range_args, partial_bars
+)
+
+app = Quart(__name__)
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+
+current_equity_data = {}
+s3 = AsyncS3Client()
+
+async def upload_to_s3(data: List[Dict[str, Any]]) -> bool:
+    """Upload stock data to S3 without blocking the event loop"""
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    filename = f'equity_data_{timestamp}.json'
+
+    # Add metadata
+    payload = {
+        'timestamp': datetime.now().isoformat(),
+        'record_count': len(data),
+        'data': data
+    }
+
+    uploaded = await s3.put_json(f"{S3_CONFIG['equity_prefix']}{filename}", payload)
+    if uploaded:
+        logging.info(f"Successfully uploaded {filename} to S3 path: {S3_CONFIG['equity_prefix']}")
+    return uploaded
+
+async def update_equity_data():
+    """Background task to continuously update equity data"""
+    global current_equity_data
+    while True:
+        try:
+            data = generate_stock_data()
+            # Index data by symbol for quick lookup
+            current_equity_data = {item['symbol']: item for item in data}
+
+            # Upload to S3 as well
+            await upload_to_s3(data)
+        except Exception as e:
+            logging.error(f"Error updating data: {str(e)}")
+        await asyncio.sleep(1)  # Update every second
+
+async def fetch_latest_day(date: str) -> List[Dict[str, Any]]:
+    """Fetch the rows of the latest equity file uploaded on a given day"""
+    objects = await s3.list_objects(f"{S3_CONFIG['equity_prefix']}equity_data_{date}")
+    if not objects:
+        return []
+    latest_file = max(objects, key=lambda x: x['LastModified'])
+    payload = await s3.get_json(latest_file['Key'])
+    return payload['data']
+
+async def iter_range_bars(dates: List[str], interval: str, symbols: Set[str]) -> AsyncIterator[pd.DataFrame]:
+    """Yield each day's bars, fetching and reducing RANGE_FETCH_BATCH files at a time as in equity_api"""
+    previous_close = {}
+    for date in dates:
+        # Keys embed the upload time, so sorted batches merge in tick order
+        objects = await s3.list_objects(f"{S3_CONFIG['equity_prefix']}equity_data_{date}")
+        keys = sorted(obj['Key'] for obj in objects)
+        day = pd.DataFrame(columns=PARTIAL_COLUMNS)
+        for start in range(0, len(keys), RANGE_FETCH_BATCH):
+            payloads = await s3.get_many_json(keys[start:start + RANGE_FETCH_BATCH])
+            records = [row for payload in payloads for row in payload['data']]
+            # Aggregate off the event loop so other requests keep being served
+            partial = await asyncio.to_thread(partial_bars, records, interval, symbols)
+            day = merge_bars([day, partial])
+
+        bars = finalize_bars(day, previous_close)
+        if not bars.empty:
+            previous_close.update(bars.groupby('symbol')['close'].last().to_dict())
+            yield bars
+
+async def stream_range_aggregates(first_bars: pd.DataFrame,
+                                  remaining: AsyncIterator[pd.DataFrame]) -> AsyncIterator[str]:
+    """Stream bars as NDJSON, ending with an error line if a later day fails"""
+    yield bars_to_ndjson(first_bars)
+    try:
+        async for bars in remaining:
+            yield bars_to_ndjson(bars)
+    except Exception as e:
+        # Headers are already sent, so report the failure in the body
+        logging.error(f"Error aggregating historical range: {str(e)}")
+        yield json.dumps({"error": str(e)}) + '\n'
+
+@app.before_serving
+async def start_background_tasks():
+    await s3.open()
+    if os.getenv('equity_asgi_generate', '1') == '1':
+        app.update_task = asyncio.create_task(update_equity_data())
+
+@app.after_serving
+async def stop_background_tasks():
+    update_task = getattr(app, 'update_task', None)
+    if update_task:
+        update_task.cancel()
+    await s3.close()
+
+@app.route('/api/equity/current', methods=['GET'])
+async def get_current_prices():
+    """Get current prices for all or specific equity"""
+    symbol = request.args.get('symbol', '').upper()
+
+    if symbol:
+        if symbol in current_equity_data:
+            return jsonify(current_equity_data[symbol])
+        return jsonify({"error": "Symbol not found"}), 404
+    return jsonify(list(current_equity_data.values()))
+
+@app.route('/api/equity/historical', methods=['GET'])
+async def get_historical_data():
+    """
+    Get historical data from S3
+
+    `symbol` and `date` accept comma-separated lists; each date is fetched
+    as a parallel S3 request on the event loop. Passing `from`/`to`/`interval`
+    streams aggregated bars, as in equity_api.
+    """
+    if 'from' in request.args:
+        try:
+            dates, interval, symbols = parse_range_args(request.args)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
+        # Read up to the first day with data so an empty range can still 404
+        bars = iter_range_bars(dates, interval, symbols)
+        try:
+            first_bars = await bars.__anext__()
+        except StopAsyncIteration:
+            return jsonify({"error": "No historical data found"}), 404
+        except Exception as e:
+            return jsonify({"error": str(e)}), 500
+        return Response(stream_range_aggregates(first_bars, bars), mimetype='application/x-ndjson')
+
+    symbols = {s for s in request.args.get('symbol', '').upper().split(',') if s}
+    dates = request.args.get('date', datetime.now().strftime('%Y%m%d')).split(',')
+
+    try:
+        days = await asyncio.gather(*(fetch_latest_day(date) for date in dates))
+        data = [item for day in days for item in day]
+
+        if not data:
+            return jsonify({"error": "No historical data found"}), 404
+
+        if symbols:
+            data = [item for item in data if item['symbol'] in symbols]
+            if not data:
+                return jsonify({"error": "No data found for symbol"}), 404
+
+        return jsonify(data)
+
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/api/equity/statistics', methods=['GET'])
+async def get_statistics():
+    """Get statistical information about equities"""
+    if not current_equity_data:
+        return jsonify({"error": "No data available"}), 404
+
+    stats = {
+        "total_stocks": len(current_equity_data),
+        "total_volume": sum(stock['volume'] for stock in current_equity_data.values()),
+        "total_market_cap": sum(stock['market_cap'] for stock in current_equity_data.values()),
+        "highest_price": max(current_equity_data.values(), key=lambda x: x['price']),
+        "lowest_price": min(current_equity_data.values(), key=lambda x: x['price']),
+        "timestamp": datetime.now().isoformat()
+    }
+    return jsonify(stats)
+
+def main():
+    # Run the ASGI app (use `hypercorn equity_asgi_api:app` in production)
+    app.run(host='0.0.0.0', port=9092)
+
+if __name__ == '__main__':
+    main()
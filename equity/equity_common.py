@@ -0,0 +1,164 @@
+"""
+Framework-neutral equity helpers shared by the Flask and ASGI APIs.
+
+Nothing here builds an app, configures logging or starts threads, so either
+service can import it without pulling in the other's setup.
+"""
+from datetime import datetime
+import logging
+import os
+import numpy as np
+import pandas as pd
+from typing import List, Dict, Any, Optional, Set, Tuple
+
+# Define stock parameters
+stocks = {
+    'AAPL': {'base_price': 150.0, 'volatility': 0.02, 'sector': 'Technology'},
+    'GOOGL': {'base_price': 2800.0, 'volatility': 0.025, 'sector': 'Technology'},
+    'MSFT': {'base_price': 300.0, 'volatility': 0.018, 'sector': 'Technology'},
+    'AMZN': {'base_price': 3300.0, 'volatility': 0.03, 'sector': 'Consumer'},
+    'META': {'base_price': 330.0, 'volatility': 0.028, 'sector': 'Technology'},
+    'TSLA': {'base_price': 250.0, 'volatility': 0.035, 'sector': 'Automotive'},
+    'JPM': {'base_price': 140.0, 'volatility': 0.015, 'sector': 'Finance'},
+    'V': {'base_price': 200.0, 'volatility': 0.012, 'sector': 'Finance'},
+    'WMT': {'base_price': 150.0, 'volatility': 0.010, 'sector': 'Retail'},
+    'PG': {'base_price': 140.0, 'volatility': 0.008, 'sector': 'Consumer'}
+}
+
+# Range queries: longest range accepted, and files fetched and reduced together
+MAX_RANGE_DAYS = int(os.getenv('historical_max_range_days', 366))
+RANGE_FETCH_BATCH = int(os.getenv('historical_range_fetch_batch', 1000))
+
+BAR_COLUMNS = ['symbol', 'timestamp', 'open', 'high', 'low', 'close', 'mean_volume', 'return']
+PARTIAL_COLUMNS = ['symbol', 'timestamp', 'open', 'high', 'low', 'close', 'volume_sum', 'count']
+
+def generate_stock_data() -> List[Dict[str, Any]]:
+    """Generate current stock data with price movements"""
+    current_time = datetime.now()
+    stock_data = []
+
+    for symbol, info in stocks.items():
+        try:
+            # Generate random price movement
+            price_change = np.random.normal(0, info['volatility'])
+            new_price = info['base_price'] * (1 + price_change)
+
+            # Update base price for next iteration (with mean reversion)
+            stocks[symbol]['base_price'] = new_price * 0.9 + info['base_price'] * 0.1
+
+            # Generate realistic volume based on price
+            base_volume = int(1000000 / new_price)  # Higher for lower-priced stocks
+            volume = int(np.random.normal(base_volume, base_volume * 0.2))
+
+            stock_data.append({
+                'symbol': symbol,
+                'sector': info['sector'],
+                'price': round(new_price, 2),
+                'volume': max(0, volume),
+                'timestamp': current_time.isoformat(),
+                'change_percent': round(price_change * 100, 2),
+                'market_cap': round(new_price * volume, 2),
+                'volatility': round(info['volatility'] * 100, 2)
+            })
+
+        except Exception as e:
+            logging.error(f"Error generating data for {symbol}: {str(e)}")
+
+    return stock_data
+
+def parse_range_args(args) -> Tuple[List[str], str, Set[str]]:
+    """Validate `from`/`to`/`interval`/`symbol` and return (dates, interval, symbols)"""
+    try:
+        start = datetime.strptime(args['from'], '%Y%m%d')
+        end = datetime.strptime(args.get('to', args['from']), '%Y%m%d')
+    except ValueError:
+        raise ValueError("from and to must be dates in YYYYMMDD format")
+    if end < start:
+        raise ValueError("to must not be before from")
+    if (end - start).days >= MAX_RANGE_DAYS:
+        raise ValueError(f"range must not exceed {MAX_RANGE_DAYS} days")
+
+    interval = args.get('interval', '1h')
+    try:
+        step = pd.Timedelta(pd.tseries.frequencies.to_offset(interval))
+    except ValueError:
+        raise ValueError(f"Invalid interval: {interval}")
+    # Bars must not straddle midnight, since ranges are aggregated one day at a time
+    if step <= pd.Timedelta(0) or pd.Timedelta(days=1) % step != pd.Timedelta(0):
+        raise ValueError("interval must evenly divide one day")
+
+    dates = list(pd.date_range(start, end, freq='D').strftime('%Y%m%d'))
+    symbols = {symbol for symbol in args.get('symbol', '').upper().split(',') if symbol}
+    return dates, interval, symbols
+
+def partial_bars(records: List[Dict[str, Any]], interval: str, symbols: Set[str]) -> pd.DataFrame:
+    """Reduce time-ordered ticks to per-symbol partial bars that merge_bars can combine"""
+    df = pd.DataFrame.from_records(records, columns=['symbol', 'price', 'volume', 'timestamp'])
+    if symbols:
+        df = df[df['symbol'].isin(symbols)]
+    if df.empty:
+        return pd.DataFrame(columns=PARTIAL_COLUMNS)
+
+    df['timestamp'] = pd.to_datetime(df['timestamp'])
+    return (
+        df.groupby(['symbol', pd.Grouper(key='timestamp', freq=interval)])
+        .agg(
+            open=('price', 'first'),
+            high=('price', 'max'),
+            low=('price', 'min'),
+            close=('price', 'last'),
+            volume_sum=('volume', 'sum'),
+            count=('volume', 'count')
+        )
+        .reset_index()
+    )
+
+def merge_bars(partials: List[pd.DataFrame]) -> pd.DataFrame:
+    """Combine partial bars, given in time order, into one partial bar per symbol and interval"""
+    partials = [partial for partial in partials if not partial.empty]
+    if not partials:
+        return pd.DataFrame(columns=PARTIAL_COLUMNS)
+    if len(partials) == 1:
+        return partials[0]
+
+    return (
+        pd.concat(partials, ignore_index=True)
+        .groupby(['symbol', 'timestamp'])
+        .agg(
+            open=('open', 'first'),
+            high=('high', 'max'),
+            low=('low', 'min'),
+            close=('close', 'last'),
+            volume_sum=('volume_sum', 'sum'),
+            count=('count', 'sum')
+        )
+        .reset_index()
+    )
+
+def finalize_bars(partials: pd.DataFrame, previous_close: Optional[Dict[str, float]] = None) -> pd.DataFrame:
+    """
+    Turn merged partial bars into OHLC bars with mean volume and returns.
+
+    `previous_close` holds each symbol's last close from the preceding day
+    so the first return of this day continues the series.
+    """
+    if partials.empty:
+        return pd.DataFrame(columns=BAR_COLUMNS)
+
+    bars = partials[['symbol', 'timestamp', 'open', 'high', 'low', 'close']].copy()
+    bars['mean_volume'] = partials['volume_sum'] / partials['count']
+    bars['return'] = bars.groupby('symbol')['close'].pct_change()
+    if previous_close:
+        first = bars.groupby('symbol').cumcount() == 0
+        prior = bars.loc[first, 'symbol'].map(previous_close)
+        bars.loc[first, 'return'] = bars.loc[first, 'close'] / prior - 1
+    return bars
+
+def aggregate_ticks(records: List[Dict[str, Any]], interval: str, symbols: Set[str],
+                    previous_close: Optional[Dict[str, float]] = None) -> pd.DataFrame:
+    """Downsample ticks into per-symbol OHLC bars with mean volume and returns in one pass"""
+    return finalize_bars(partial_bars(records, interval, symbols), previous_close)
+
+def bars_to_ndjson(bars: pd.DataFrame) -> str:
+    """Serialize bars as newline-delimited JSON records"""
+    return bars.to_json(orient='records', lines=True, date_format='iso').rstrip('\n') + '\n'
@@ -17,7 +17,8 @@ class EquityDataGenerator:
             's3',
             aws_access_key_id=os.getenv('access_key'),
             aws_secret_access_key=os.getenv('secret_key'),
-            region_name=os.getenv('region')
+            region_name=os.getenv('region'),
+            endpoint_url=os.getenv('s3_endpoint_url')
         )
         self.bucket_name = os.getenv('bucket')
         self.prefix = os.getenv('equity_prefix')
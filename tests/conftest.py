@@ -0,0 +1,73 @@
+"""
+Fixtures for the correctness tests.
+
+S3 is a local moto server, so the tests need no AWS credentials, network
+access or benchmark plugin.
+"""
+import json
+import os
+import socket
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+sys.path.append(os.path.join(ROOT, 'equity'))
+
+@pytest.fixture(scope='session', autouse=True)
+def s3_server():
+    """Moto S3 server with the repo's bucket created; repo modules import after this"""
+    from moto.server import ThreadedMotoServer
+
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        port = sock.getsockname()[1]
+    server = ThreadedMotoServer(ip_address='127.0.0.1', port=port, verbose=False)
+    server.start()
+    os.environ.update({
+        's3_endpoint_url': f'http://127.0.0.1:{port}',
+        'access_key': 'testing',
+        'secret_key': 'testing',
+        'region': 'us-east-1',
+        'bucket': 'test-bucket',
+        'equity_prefix': 'equity-data/',
+        'equity_asgi_generate': '0'
+    })
+
+    from config import s3_client, S3_CONFIG
+    s3_client.create_bucket(Bucket=S3_CONFIG['bucket_name'])
+    yield server
+    server.stop()
+
+@pytest.fixture(scope='session')
+def equity_api():
+    import equity_api
+    return equity_api
+
+@pytest.fixture(scope='session')
+def equity_asgi_api():
+    import equity_asgi_api
+    return equity_asgi_api
+
+@pytest.fixture(scope='session')
+def equity_days():
+    """Seed two days of half-hourly equity files; returns {day: records in upload order}"""
+    from config import s3_client, S3_CONFIG
+    from equity_common import generate_stock_data
+
+    days = {}
+    for day in ('20240102', '20240103'):
+        days[day] = []
+        for index in range(12):
+            timestamp = f'{day[:4]}-{day[4:6]}-{day[6:]}T{index // 2:02d}:{index % 2 * 30:02d}:00'
+            data = generate_stock_data()
+            for row in data:
+                row['timestamp'] = timestamp
+            s3_client.put_object(
+                Bucket=S3_CONFIG['bucket_name'],
+                Key=f"{S3_CONFIG['equity_prefix']}equity_data_{day}_{index:06d}.json",
+                Body=json.dumps({'timestamp': timestamp, 'record_count': len(data), 'data': data})
+            )
+            days[day].extend(data)
+    return days
@@ -0,0 +1,147 @@
+"""Correctness checks for the historical range queries of both equity APIs"""
+import asyncio
+import json
+
+import pandas as pd
+import pytest
+
+from equity_common import aggregate_ticks, bars_to_ndjson, finalize_bars, merge_bars, partial_bars
+
+def tick(symbol, timestamp, price, volume):
+    return {'symbol': symbol, 'price': price, 'volume': volume, 'timestamp': timestamp}
+
+def expected_stream(equity_days, interval='1h'):
+    """NDJSON a range over every seeded day should produce"""
+    lines, previous_close = [], {}
+    for records in equity_days.values():
+        bars = aggregate_ticks(records, interval, set(), previous_close)
+        previous_close.update(bars.groupby('symbol')['close'].last().to_dict())
+        lines.append(bars_to_ndjson(bars))
+    return ''.join(lines)
+
+def range_query(equity_days):
+    first, last = min(equity_days), max(equity_days)
+    return f'/api/equity/historical?from={first}&to={last}&interval=1h'
+
+def test_aggregate_ticks_ohlc_and_mean_volume():
+    records = [
+        tick('AAPL', '2024-01-02T00:05:00', 10.0, 100),
+        tick('AAPL', '2024-01-02T00:20:00', 12.0, 300),
+        tick('AAPL', '2024-01-02T00:40:00', 9.0, 200),
+        tick('AAPL', '2024-01-02T01:10:00', 11.0, 400),
+    ]
+    bars = aggregate_ticks(records, '1h', set())
+
+    assert bars['timestamp'].astype(str).tolist() == ['2024-01-02 00:00:00', '2024-01-02 01:00:00']
+    first, second = bars.to_dict('records')
+    assert (first['open'], first['high'], first['low'], first['close']) == (10.0, 12.0, 9.0, 9.0)
+    assert first['mean_volume'] == 200
+    assert (second['open'], second['close'], second['mean_volume']) == (11.0, 11.0, 400)
+    assert second['return'] == pytest.approx(11.0 / 9.0 - 1)
+
+def test_aggregate_ticks_carries_return_across_days():
+    records = [
+        tick('AAPL', '2024-01-03T00:05:00', 110.0, 100),
+        tick('MSFT', '2024-01-03T00:05:00', 45.0, 100),
+    ]
+    bars = aggregate_ticks(records, '1h', set(), {'AAPL': 100.0, 'MSFT': 50.0})
+    returns = dict(zip(bars['symbol'], bars['return']))
+
+    assert returns['AAPL'] == pytest.approx(0.10)
+    assert returns['MSFT'] == pytest.approx(-0.10)
+
+def test_aggregate_ticks_filters_symbols():
+    records = [
+        tick('AAPL', '2024-01-02T00:05:00', 10.0, 100),
+        tick('MSFT', '2024-01-02T00:05:00', 20.0, 100),
+        tick('TSLA', '2024-01-02T00:05:00', 30.0, 100),
+    ]
+    bars = aggregate_ticks(records, '1h', {'AAPL', 'TSLA'})
+    assert sorted(bars['symbol']) == ['AAPL', 'TSLA']
+
+    assert aggregate_ticks(records, '1h', {'GOOGL'}).empty
+
+def test_merged_partial_bars_match_single_pass(equity_days):
+    records = equity_days['20240102']
+    batches = [records[start:start + 35] for start in range(0, len(records), 35)]
+    merged = finalize_bars(merge_bars([partial_bars(batch, '1h', set()) for batch in batches]))
+
+    pd.testing.assert_frame_equal(merged, aggregate_ticks(records, '1h', set()))
+
+@pytest.mark.parametrize('query', [
+    'from=20240102&interval=7min',
+    'from=20240102&interval=2D',
+    'from=2024-01-02',
+    'from=20240102&to=20240101',
+    'from=20240101&to=20250101',
+])
+def test_range_rejects_invalid_arguments(equity_api, query):
+    response = equity_api.app.test_client().get(f'/api/equity/historical?{query}')
+    assert response.status_code == 400
+    assert 'error' in response.json
+
+def test_range_streams_bars_in_batches(equity_api, equity_days, monkeypatch):
+    monkeypatch.setattr(equity_api, 'RANGE_FETCH_BATCH', 5)
+    response = equity_api.app.test_client().get(range_query(equity_days))
+
+    assert response.status_code == 200
+    assert response.mimetype == 'application/x-ndjson'
+    assert response.get_data(as_text=True) == expected_stream(equity_days)
+
+def test_range_without_data_returns_404(equity_api):
+    response = equity_api.app.test_client().get('/api/equity/historical?from=19990101&to=19990110')
+    assert response.status_code == 404
+
+def test_range_reports_failed_day_in_stream(equity_api, equity_days, monkeypatch):
+    first_day = min(equity_days)
+    list_day_keys = equity_api.list_day_keys
+
+    def failing_after_first_day(date):
+        if date != first_day:
+            raise RuntimeError('S3 unavailable')
+        return list_day_keys(date)
+
+    monkeypatch.setattr(equity_api, 'list_day_keys', failing_after_first_day)
+    response = equity_api.app.test_client().get(range_query(equity_days))
+
+    assert response.status_code == 200
+    lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert lines[:-1] and all('close' in line for line in lines[:-1])
+    assert lines[-1] == {'error': 'S3 unavailable'}
+
+def asgi_get(app, path):
+    """Issue one request against the ASGI app with its startup and shutdown hooks run"""
+    async def get():
+        async with app.test_app() as test_app:
+            response = await test_app.test_client().get(path)
+            return response.status_code, await response.get_data(as_text=True)
+    return asyncio.run(get())
+
+def test_asgi_range_streams_bars_in_batches(equity_asgi_api, equity_days, monkeypatch):
+    monkeypatch.setattr(equity_asgi_api, 'RANGE_FETCH_BATCH', 5)
+    status, body = asgi_get(equity_asgi_api.app, range_query(equity_days))
+
+    assert status == 200
+    assert body == expected_stream(equity_days)
+
+def test_asgi_range_without_data_returns_404(equity_asgi_api):
+    status, _ = asgi_get(equity_asgi_api.app, '/api/equity/historical?from=19990101&to=19990110')
+    assert status == 404
+
+def test_asgi_range_reports_failed_day_in_stream(equity_asgi_api, equity_days, monkeypatch):
+    first_day = min(equity_days)
+    s3 = equity_asgi_api.s3
+    list_objects = s3.list_objects
+
+    async def failing_after_first_day(prefix):
+        if not prefix.endswith(first_day):
+            raise RuntimeError('S3 unavailable')
+        return await list_objects(prefix)
+
+    monkeypatch.setattr(s3, 'list_objects', failing_after_first_day)
+    status, body = asgi_get(equity_asgi_api.app, range_query(equity_days))
+
+    assert status == 200
+    lines = [json.loads(line) for line in body.splitlines()]
+    assert lines[:-1] and all('close' in line for line in lines[:-1])
+    assert lines[-1] == {'error': 'S3 unavailable'}